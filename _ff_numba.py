@@ -0,0 +1,428 @@
+"""Numba kernels for secp256k1 field and point arithmetic on 4 x uint64 limbs
+
+Field elements are little-endian uint64[4] arrays holding canonical values in
+[0, p). Jacobian points are uint64[3, 4] arrays (X, Y, Z); Z == 0 is the point
+at infinity. Every 64 x 64-bit product is split into 32-bit halves so no
+intermediate ever overflows uint64, and all constants are typed uint64 so
+numba never promotes to int64/float64.
+"""
+
+import numpy as np
+from numba import njit
+
+_M32 = np.uint64(0xFFFFFFFF)
+_S32 = np.uint64(32)
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+_C = np.uint64(0x1000003D1)  # 2^256 mod p = 2^32 + 977
+_P = np.array([0xFFFFFFFEFFFFFC2F, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)
+
+
+def to_limbs(v):
+    """Split a non-negative Python integer < 2^256 into 4 little-endian uint64 limbs"""
+    v = int(v)
+    return np.array([(v >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(4)], dtype=np.uint64)
+
+
+def from_limbs(a):
+    """Join 4 little-endian uint64 limbs back into a Python integer"""
+    return int(a[0]) | int(a[1]) << 64 | int(a[2]) << 128 | int(a[3]) << 192
+
+
+@njit(cache=True)
+def _mul64(a, b):
+    """Full 128-bit product of two uint64 values as (hi, lo)"""
+    a_lo = a & _M32
+    a_hi = a >> _S32
+    b_lo = b & _M32
+    b_hi = b >> _S32
+    p0 = a_lo * b_lo
+    p1 = a_lo * b_hi
+    p2 = a_hi * b_lo
+    p3 = a_hi * b_hi
+    mid = (p0 >> _S32) + (p1 & _M32) + (p2 & _M32)
+    lo = (p0 & _M32) | (mid << _S32)
+    hi = p3 + (p1 >> _S32) + (p2 >> _S32) + (mid >> _S32)
+    return hi, lo
+
+
+@njit(cache=True)
+def _geq_p(a):
+    """a >= p for a 4-limb value"""
+    for i in range(3, -1, -1):
+        if a[i] != _P[i]:
+            return a[i] > _P[i]
+    return True
+
+
+@njit(cache=True)
+def _add_c(a):
+    """a += 2^32 + 977 modulo 2^256 (subtracts p from a value in [p, 2^256 + p))"""
+    s = a[0] + _C
+    carry = _ONE if s < _C else _ZERO
+    a[0] = s
+    for i in range(1, 4):
+        s = a[i] + carry
+        carry = _ONE if s < carry else _ZERO
+        a[i] = s
+
+
+@njit(cache=True)
+def is_zero(a):
+    """a == 0 for a 4-limb value"""
+    return (a[0] | a[1] | a[2] | a[3]) == _ZERO
+
+
+@njit(cache=True)
+def add_mod(a, b, out):
+    """out = (a + b) mod p"""
+    carry = _ZERO
+    for i in range(4):
+        s = a[i] + carry
+        c1 = _ONE if s < carry else _ZERO
+        s2 = s + b[i]
+        c2 = _ONE if s2 < s else _ZERO
+        out[i] = s2
+        carry = c1 + c2
+    if carry != _ZERO or _geq_p(out):
+        _add_c(out)
+
+
+@njit(cache=True)
+def sub_mod(a, b, out):
+    """out = (a - b) mod p"""
+    borrow = _ZERO
+    for i in range(4):
+        d = a[i] - b[i]
+        b1 = _ONE if a[i] < b[i] else _ZERO
+        d2 = d - borrow
+        b2 = _ONE if d < borrow else _ZERO
+        out[i] = d2
+        borrow = b1 + b2
+    if borrow != _ZERO:
+        # out holds a - b + 2^256; a - b + p = out - (2^32 + 977)
+        d = out[0] - _C
+        borrow = _ONE if out[0] < _C else _ZERO
+        out[0] = d
+        for i in range(1, 4):
+            d = out[i] - borrow
+            borrow = _ONE if out[i] < borrow else _ZERO
+            out[i] = d
+
+
+@njit(cache=True)
+def _mac(c0, c1, c2, a, b):
+    """(c0, c1, c2) += a * b on a 3-limb accumulator"""
+    hi, lo = _mul64(a, b)
+    c0 = c0 + lo
+    hi = hi + (_ONE if c0 < lo else _ZERO)  # hi < 2^64 - 1, cannot overflow
+    c1 = c1 + hi
+    c2 = c2 + (_ONE if c1 < hi else _ZERO)
+    return c0, c1, c2
+
+
+@njit(cache=True)
+def _acc(c0, c1, c2, a):
+    """(c0, c1, c2) += a on a 3-limb accumulator"""
+    c0 = c0 + a
+    carry = _ONE if c0 < a else _ZERO
+    c1 = c1 + carry
+    c2 = c2 + (_ONE if c1 < carry else _ZERO)
+    return c0, c1, c2
+
+
+@njit(cache=True)
+def mul_mod(a, b, out):
+    """out = (a * b) mod p via a 4x4 column-wise product and pseudo-Mersenne folding"""
+    a0, a1, a2, a3 = a[0], a[1], a[2], a[3]
+    b0, b1, b2, b3 = b[0], b[1], b[2], b[3]
+
+    # 512-bit product t0..t7, one column at a time
+    c0, c1, c2 = _mac(_ZERO, _ZERO, _ZERO, a0, b0)
+    t0, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a0, b1)
+    c0, c1, c2 = _mac(c0, c1, c2, a1, b0)
+    t1, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a0, b2)
+    c0, c1, c2 = _mac(c0, c1, c2, a1, b1)
+    c0, c1, c2 = _mac(c0, c1, c2, a2, b0)
+    t2, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a0, b3)
+    c0, c1, c2 = _mac(c0, c1, c2, a1, b2)
+    c0, c1, c2 = _mac(c0, c1, c2, a2, b1)
+    c0, c1, c2 = _mac(c0, c1, c2, a3, b0)
+    t3, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a1, b3)
+    c0, c1, c2 = _mac(c0, c1, c2, a2, b2)
+    c0, c1, c2 = _mac(c0, c1, c2, a3, b1)
+    t4, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a2, b3)
+    c0, c1, c2 = _mac(c0, c1, c2, a3, b2)
+    t5, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _mac(c0, c1, c2, a3, b3)
+    t6, t7 = c0, c1
+
+    # Fold the high half: t_lo + t_hi * (2^32 + 977), a 5-limb value below 2^290
+    c0, c1, c2 = _mac(t0, _ZERO, _ZERO, t4, _C)
+    r0, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _acc(c0, c1, c2, t1)
+    c0, c1, c2 = _mac(c0, c1, c2, t5, _C)
+    r1, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _acc(c0, c1, c2, t2)
+    c0, c1, c2 = _mac(c0, c1, c2, t6, _C)
+    r2, c0, c1, c2 = c0, c1, c2, _ZERO
+    c0, c1, c2 = _acc(c0, c1, c2, t3)
+    c0, c1, c2 = _mac(c0, c1, c2, t7, _C)
+    r3, r4 = c0, c1
+
+    # Fold the remaining top limb (below 2^34) once more
+    c0, c1, c2 = _mac(r0, _ZERO, _ZERO, r4, _C)
+    out[0] = c0
+    c0, c1, c2 = _acc(c1, c2, _ZERO, r1)
+    out[1] = c0
+    c0, c1, c2 = _acc(c1, c2, _ZERO, r2)
+    out[2] = c0
+    c0, c1, c2 = _acc(c1, c2, _ZERO, r3)
+    out[3] = c0
+    if c1 != _ZERO:
+        _add_c(out)
+    if _geq_p(out):
+        _add_c(out)
+
+
+@njit(cache=True)
+def _sqr_n(a, n, out):
+    """out = a^(2^n) mod p"""
+    mul_mod(a, a, out)
+    for _ in range(n - 1):
+        mul_mod(out, out, out)
+
+
+@njit(cache=True)
+def inv_mod(a, out):
+    """out = a^(p-2) mod p (Fermat inversion; 0 maps to 0)
+
+    Uses the fixed addition chain for p - 2 = 2^256 - 2^32 - 979: 255
+    squarings and 15 multiplications instead of ~250 with square-and-multiply.
+    xN holds a^(2^N - 1).
+    """
+    x2 = np.empty(4, dtype=np.uint64)
+    x3 = np.empty(4, dtype=np.uint64)
+    x11 = np.empty(4, dtype=np.uint64)
+    x22 = np.empty(4, dtype=np.uint64)
+    x44 = np.empty(4, dtype=np.uint64)
+    t = np.empty(4, dtype=np.uint64)
+    u = np.empty(4, dtype=np.uint64)
+
+    mul_mod(a, a, x2)
+    mul_mod(x2, a, x2)
+    mul_mod(x2, x2, x3)
+    mul_mod(x3, a, x3)
+    _sqr_n(x3, 3, t)
+    mul_mod(t, x3, t)  # x6
+    _sqr_n(t, 3, u)
+    mul_mod(u, x3, u)  # x9
+    _sqr_n(u, 2, x11)
+    mul_mod(x11, x2, x11)
+    _sqr_n(x11, 11, x22)
+    mul_mod(x22, x11, x22)
+    _sqr_n(x22, 22, x44)
+    mul_mod(x44, x22, x44)
+    _sqr_n(x44, 44, t)
+    mul_mod(t, x44, t)  # x88
+    _sqr_n(t, 88, u)
+    mul_mod(u, t, u)  # x176
+    _sqr_n(u, 44, t)
+    mul_mod(t, x44, t)  # x220
+    _sqr_n(t, 3, u)
+    mul_mod(u, x3, u)  # x223
+
+    # p - 2 = (2^223 - 1) 2^33 + (2^22 - 1) 2^10 + 2^5 + 3 * 2^2 + 1
+    _sqr_n(u, 23, t)
+    mul_mod(t, x22, t)
+    _sqr_n(t, 5, u)
+    mul_mod(u, a, u)
+    _sqr_n(u, 3, t)
+    mul_mod(t, x2, t)
+    _sqr_n(t, 2, u)
+    mul_mod(u, a, out)
+
+
+@njit(cache=True)
+def jac_double(P, out, S):
+    """out = 2P in Jacobian coordinates (a = 0); out may alias P, S is uint64[8, 4] scratch"""
+    if is_zero(P[2]) or is_zero(P[1]):
+        out[:] = 0
+        return
+    A, B, C, D, T = S[0], S[1], S[2], S[3], S[4]
+
+    mul_mod(P[1], P[1], A)  # A = Y^2
+    mul_mod(P[0], A, B)
+    add_mod(B, B, B)
+    add_mod(B, B, B)  # B = 4 X A
+    mul_mod(A, A, C)
+    add_mod(C, C, C)
+    add_mod(C, C, C)
+    add_mod(C, C, C)  # C = 8 A^2
+    mul_mod(P[0], P[0], T)
+    add_mod(T, T, D)
+    add_mod(D, T, D)  # D = 3 X^2
+
+    mul_mod(P[1], P[2], T)
+    add_mod(T, T, out[2])  # Z3 = 2 Y Z
+    mul_mod(D, D, T)
+    sub_mod(T, B, T)
+    sub_mod(T, B, out[0])  # X3 = D^2 - 2B
+    sub_mod(B, out[0], T)
+    mul_mod(D, T, T)
+    sub_mod(T, C, out[1])  # Y3 = D (B - X3) - C
+
+
+@njit(cache=True)
+def jac_add(P, Q, out, S):
+    """out = P + Q in Jacobian coordinates; out may alias P or Q, S is uint64[8, 4] scratch"""
+    if is_zero(P[2]):
+        out[:] = Q
+        return
+    if is_zero(Q[2]):
+        out[:] = P
+        return
+    Z1Z1, Z2Z2, U1, U2, S1, S2, V, T = S[0], S[1], S[2], S[3], S[4], S[5], S[6], S[7]
+
+    mul_mod(P[2], P[2], Z1Z1)
+    mul_mod(Q[2], Q[2], Z2Z2)
+    mul_mod(P[0], Z2Z2, U1)
+    mul_mod(Q[0], Z1Z1, U2)
+    mul_mod(P[1], Q[2], S1)
+    mul_mod(S1, Z2Z2, S1)
+    mul_mod(Q[1], P[2], S2)
+    mul_mod(S2, Z1Z1, S2)
+    sub_mod(U2, U1, U2)  # H
+    sub_mod(S2, S1, S2)  # R
+
+    # Same x-coordinate: either the same point or inverses of each other
+    if is_zero(U2):
+        if is_zero(S2):
+            jac_double(P, out, S)
+        else:
+            out[:] = 0
+        return
+
+    H = U2
+    R = S2
+    HH = Z1Z1
+    HHH = Z2Z2
+    mul_mod(P[2], Q[2], T)
+    mul_mod(H, H, HH)
+    mul_mod(H, HH, HHH)
+    mul_mod(U1, HH, V)
+    mul_mod(T, H, out[2])  # Z3 = Z1 Z2 H
+
+    mul_mod(R, R, T)
+    sub_mod(T, HHH, T)
+    sub_mod(T, V, T)
+    sub_mod(T, V, out[0])  # X3 = R^2 - HHH - 2V
+    sub_mod(V, out[0], T)
+    mul_mod(R, T, T)
+    mul_mod(S1, HHH, V)
+    sub_mod(T, V, out[1])  # Y3 = R (V - X3) - S1 HHH
+
+
+@njit(cache=True)
+def to_affine(J, out):
+    """out = (X / Z^2, Y / Z^3); returns False for the point at infinity"""
+    if is_zero(J[2]):
+        return False
+    z_inv = np.empty(4, dtype=np.uint64)
+    z_inv2 = np.empty(4, dtype=np.uint64)
+    inv_mod(J[2], z_inv)
+    mul_mod(z_inv, z_inv, z_inv2)
+    mul_mod(J[0], z_inv2, out[0])
+    mul_mod(z_inv2, z_inv, z_inv)
+    mul_mod(J[1], z_inv, out[1])
+    return True
+
+
+@njit(cache=True)
+def scalar_multiply(k, nbits, x, y, out):
+    """Left-to-right double-and-add k * (x, y); k is a 4-limb scalar"""
+    P = np.zeros((3, 4), dtype=np.uint64)
+    P[0] = x
+    P[1] = y
+    P[2, 0] = _ONE
+    R = np.zeros((3, 4), dtype=np.uint64)
+    S = np.empty((8, 4), dtype=np.uint64)
+    for i in range(nbits - 1, -1, -1):
+        jac_double(R, R, S)
+        if (k[i >> 6] >> np.uint64(i & 63)) & _ONE:
+            jac_add(R, P, R, S)
+    return to_affine(R, out)
+
+
+@njit(cache=True)
+def scalar_multiply_ct(k, nbits, x, y, out):
+    """Montgomery ladder (2^nbits + k) * (x, y): one addition and one doubling per bit
+
+    The implicit top bit starts the ladder at (P, 2P), so the work does not
+    depend on the length of k. R0 and R1 only reach the point at infinity in
+    the last step, and only when 2^nbits + k is 2n - 2, 2n - 1 or 2n + 1 for the
+    order n of P (see EllipticCurve.scalar_multiply_ct).
+    """
+    R = np.zeros((2, 3, 4), dtype=np.uint64)
+    R[0, 0] = x
+    R[0, 1] = y
+    R[0, 2, 0] = _ONE
+    S = np.empty((8, 4), dtype=np.uint64)
+    jac_double(R[0], R[1], S)
+    for i in range(nbits - 1, -1, -1):
+        bit = np.int64((k[i >> 6] >> np.uint64(i & 63)) & _ONE)
+        jac_add(R[0], R[1], R[1 - bit], S)
+        jac_double(R[bit], R[bit], S)
+    return to_affine(R[0], out)
+
+
+@njit(cache=True)
+def double_scalar_multiply(u1, x1, y1, u2, x2, y2, nbits, out):
+    """u1 * (x1, y1) + u2 * (x2, y2) with one shared doubling chain (Shamir's trick)"""
+    T = np.zeros((4, 3, 4), dtype=np.uint64)
+    T[1, 0] = x1
+    T[1, 1] = y1
+    T[1, 2, 0] = _ONE
+    T[2, 0] = x2
+    T[2, 1] = y2
+    T[2, 2, 0] = _ONE
+    S = np.empty((8, 4), dtype=np.uint64)
+    jac_add(T[1], T[2], T[3], S)
+    R = np.zeros((3, 4), dtype=np.uint64)
+    for i in range(nbits - 1, -1, -1):
+        jac_double(R, R, S)
+        shift = np.uint64(i & 63)
+        index = ((u1[i >> 6] >> shift) & _ONE) | ((u2[i >> 6] >> shift) & _ONE) << _ONE
+        if index:
+            jac_add(R, T[index], R, S)
+    return to_affine(R, out)
+
+
+def _affine(found, out):
+    return (from_limbs(out[0]), from_limbs(out[1])) if found else None
+
+
+def multiply(k, nbits, x, y):
+    """k * (x, y) for Python integers; returns None for the point at infinity"""
+    out = np.zeros((2, 4), dtype=np.uint64)
+    return _affine(scalar_multiply(to_limbs(k), nbits, to_limbs(x), to_limbs(y), out), out)
+
+
+def multiply_ct(k, nbits, x, y):
+    """Montgomery-ladder (2^nbits + k) * (x, y) for Python integers; returns None for the point at infinity"""
+    out = np.zeros((2, 4), dtype=np.uint64)
+    return _affine(scalar_multiply_ct(to_limbs(k), nbits, to_limbs(x), to_limbs(y), out), out)
+
+
+def double_multiply(u1, x1, y1, u2, x2, y2, nbits):
+    """u1 * (x1, y1) + u2 * (x2, y2) for Python integers; returns None for the point at infinity"""
+    out = np.zeros((2, 4), dtype=np.uint64)
+    found = double_scalar_multiply(
+        to_limbs(u1), to_limbs(x1), to_limbs(y1), to_limbs(u2), to_limbs(x2), to_limbs(y2), nbits, out
+    )
+    return _affine(found, out)
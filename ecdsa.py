@@ -1,71 +1,129 @@
 #!/usr/bin/env python3
 
 import sys
-import random
+import secrets
+from typing import List
+
+try:
+    from gmpy2 import mpz, powmod, invert, f_mod
+except ImportError:
+    # gmpy2 is optional; fall back to plain Python integers
+    mpz = int
+    powmod = pow
+
+    def invert(a: int, p: int) -> int:
+        return pow(a, -1, p)
+
+    def f_mod(a: int, p: int) -> int:
+        return a % p
+
+SECP256K1_P = 2**256 - 2**32 - 977
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# GLV endomorphism phi(x, y) = (BETA * x, y) = LAMBDA * (x, y) on secp256k1, and a
+# reduced basis (A1, B1), (A2, B2) of the lattice {(a, b) : a + b * LAMBDA = 0 mod n}
+SECP256K1_BETA = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+SECP256K1_LAMBDA = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+SECP256K1_A1 = 0x3086D221A7D46BCDE86C90E49284EB15
+SECP256K1_B1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+SECP256K1_A2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+SECP256K1_B2 = SECP256K1_A1
+
+def _load_numba():
+    """Import the numba kernels on first use; None if numba is not installed"""
+    try:
+        import _ff_numba
+    except ImportError:
+        # numba is optional; secp256k1 then uses the pure-Python path below
+        return None
+    return _ff_numba
 
 class FiniteField:
     """Finite field arithmetic operations"""
     
     @staticmethod
-    def add(a, b, p):
+    def add(a: int, b: int, p: int) -> int:
         """Addition in finite field Zp"""
         return (a + b) % p
     
     @staticmethod
-    def subtract(a, b, p):
+    def subtract(a: int, b: int, p: int) -> int:
         """Subtraction in finite field Zp"""
         return (a - b) % p
     
     @staticmethod
-    def multiply(a, b, p):
+    def multiply(a: int, b: int, p: int) -> int:
         """Multiplication in finite field Zp"""
-        return (a * b) % p
+        # A shift-and-fold reduction for p = 2^256 - 2^32 - 977 is slower than one
+        # C-level division when written in Python; see _ff_numba.mul_mod instead
+        return f_mod(a * b, p)
     
     @staticmethod
-    def power(base, exp, p):
+    def power(base: int, exp: int, p: int) -> int:
         """Exponentiation in finite field Zp using fast exponentiation"""
-        result = 1
-        base = base % p
-        while exp > 0:
-            if exp % 2 == 1:
-                result = (result * base) % p
-            exp = exp >> 1
-            base = (base * base) % p
-        return result
+        return powmod(base, exp, p)
+    
+    @staticmethod
+    def inverse(a: int, p: int) -> int:
+        """Multiplicative inverse in finite field Zp (C-level extended Euclidean algorithm)"""
+        if a % p == 0:
+            return mpz(0)  # No inverse exists
+        try:
+            return invert(a, p)
+        except (ZeroDivisionError, ValueError):
+            return mpz(0)  # a shares a factor with a composite modulus
     
     @staticmethod
-    def inverse(a, p):
-        """Multiplicative inverse in finite field Zp using extended Euclidean algorithm"""
-        if a == 0:
-            return 0
-        
-        # Extended Euclidean Algorithm
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd, x, _ = extended_gcd(a % p, p)
-        if gcd != 1:
-            return 0  # No inverse exists
-        return (x % p + p) % p
+    def batch_inverse(zs: List[int], p: int) -> List[int]:
+        """Invert every element of zs with a single inversion (Montgomery's trick); zeros map to 0
+        
+        For a composite p, one non-zero element without an inverse makes the whole
+        product non-invertible and every result 0; callers must fall back to inverse.
+        """
+        acc = [mpz(1)]
+        for z in zs:
+            acc.append(acc[-1] * z % p if z else acc[-1])
+        
+        inv = FiniteField.inverse(acc[-1], p)
+        out = [mpz(0)] * len(zs)
+        for i in range(len(zs) - 1, -1, -1):
+            z = zs[i]
+            if z:
+                out[i] = acc[i] * inv % p
+                inv = inv * z % p
+        return out
     
     @staticmethod
-    def divide(a, b, p):
+    def divide(a: int, b: int, p: int) -> int:
         """Division in finite field Zp (a / b = a * b^(-1))"""
         return FiniteField.multiply(a, FiniteField.inverse(b, p), p)
 
+class JacobianPoint:
+    """Mutable Jacobian point (X, Y, Z) ~ (X/Z^2, Y/Z^3); Z = 0 is the point at infinity"""
+    
+    __slots__ = ('X', 'Y', 'Z')
+    
+    def __init__(self, X=1, Y=1, Z=0):
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+    
+    def set_infinity(self):
+        """Overwrite this point with the point at infinity"""
+        self.X = self.Y = 1
+        self.Z = 0
+
 class EllipticCurve:
     """Elliptic curve operations for secp256k1 (y^2 = x^3 + 7)"""
     
-    def __init__(self, p):
+    def __init__(self, p: int, use_numba: bool = False) -> None:
         self.p = p
         self.a = 0  # secp256k1 parameter
         self.b = 7  # secp256k1 parameter
         self.O = None  # Point at infinity
+        # Opt-in uint64-limb kernels for secp256k1; importing numba costs ~0.5 s
+        self.numba = _load_numba() if use_numba and p == SECP256K1_P else None
+        self.use_numba = self.numba is not None
     
     def is_point_at_infinity(self, point):
         """Check if point is the point at infinity"""
@@ -79,33 +137,26 @@ class EllipticCurve:
         if self.is_point_at_infinity(Q):
             return P
         
+        p = self.p
         x1, y1 = P
         x2, y2 = Q
         
         # Check if points are inverses of each other
         if x1 == x2:
-            if y1 == FiniteField.subtract(0, y2, self.p):
+            if (y1 + y2) % p == 0:
                 return self.O  # Point at infinity
             elif y1 == y2:
                 return self.point_double(P)
         
-        # Different points case
+        # Different points case, one reduction per product
         # m = (y2 - y1) / (x2 - x1)
-        numerator = FiniteField.subtract(y2, y1, self.p)
-        denominator = FiniteField.subtract(x2, x1, self.p)
-        m = FiniteField.divide(numerator, denominator, self.p)
+        m = (y2 - y1) * FiniteField.inverse((x2 - x1) % p, p) % p
         
         # x3 = m^2 - x1 - x2
-        x3 = FiniteField.subtract(
-            FiniteField.subtract(FiniteField.multiply(m, m, self.p), x1, self.p),
-            x2, self.p
-        )
+        x3 = (m * m - x1 - x2) % p
         
         # y3 = m(x1 - x3) - y1
-        y3 = FiniteField.subtract(
-            FiniteField.multiply(m, FiniteField.subtract(x1, x3, self.p), self.p),
-            y1, self.p
-        )
+        y3 = (m * (x1 - x3) - y1) % p
         
         return (x3, y3)
     
@@ -120,28 +171,191 @@ class EllipticCurve:
         if y == 0:
             return self.O
         
+        p = self.p
+        
         # m = (3x^2 + a) / (2y) = 3x^2 / (2y) since a = 0 for secp256k1
-        numerator = FiniteField.multiply(3, FiniteField.multiply(x, x, self.p), self.p)
-        denominator = FiniteField.multiply(2, y, self.p)
-        m = FiniteField.divide(numerator, denominator, self.p)
+        m = 3 * x * x * FiniteField.inverse(2 * y % p, p) % p
         
         # x3 = m^2 - 2x
-        x3 = FiniteField.subtract(
-            FiniteField.multiply(m, m, self.p),
-            FiniteField.multiply(2, x, self.p),
-            self.p
-        )
+        x3 = (m * m - 2 * x) % p
         
         # y3 = m(x - x3) - y
-        y3 = FiniteField.subtract(
-            FiniteField.multiply(m, FiniteField.subtract(x, x3, self.p), self.p),
-            y, self.p
-        )
+        y3 = (m * (x - x3) - y) % p
         
         return (x3, y3)
     
-    def scalar_multiply(self, k, P):
-        """Multiply point P by scalar k using double-and-add algorithm"""
+    def negate(self, P):
+        """Negate a point: -(x, y) = (x, -y)"""
+        if self.is_point_at_infinity(P):
+            return self.O
+        x, y = P
+        return (x, self.p - y if y else y)
+    
+    def _fits_limbs(self, P, *scalars):
+        """Check that P and the scalars can be passed to the 4 x uint64 limb kernels"""
+        return (0 <= P[0] < self.p and 0 <= P[1] < self.p
+                and all(0 <= k and k.bit_length() <= 256 for k in scalars))
+    
+    def _from_limbs(self, R):
+        """Convert a limb kernel result back to an affine point"""
+        if R is None:
+            return self.O
+        return (mpz(R[0]), mpz(R[1]))
+    
+    def to_jacobian(self, P):
+        """Convert an affine point (x, y) to a new JacobianPoint (x, y, 1)"""
+        if self.is_point_at_infinity(P):
+            return JacobianPoint()
+        return JacobianPoint(P[0], P[1], mpz(1))
+    
+    def to_affine(self, J):
+        """Convert a JacobianPoint back to affine (X/Z^2, Y/Z^3)"""
+        X, Y, Z = J.X, J.Y, J.Z
+        if Z == 0:
+            return self.O
+        p = self.p
+        z_inv = FiniteField.inverse(Z, p)
+        z_inv2 = z_inv * z_inv % p
+        return (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    
+    def to_affine_batch(self, points):
+        """Convert many Jacobian points to affine with one shared inversion"""
+        p = self.p
+        z_invs = FiniteField.batch_inverse([J.Z for J in points], p)
+        affine = []
+        for J, z_inv in zip(points, z_invs):
+            if J.Z == 0:
+                affine.append(self.O)
+                continue
+            z_inv2 = z_inv * z_inv % p
+            affine.append((J.X * z_inv2 % p, J.Y * z_inv2 * z_inv % p))
+        return affine
+    
+    def _jac_double(self, src, dst):
+        """dst = 2 * src in Jacobian coordinates (a = 0 formulas, no inversion); dst may be src"""
+        X, Y, Z = src.X, src.Y, src.Z
+        if Z == 0 or Y == 0:
+            dst.set_infinity()
+            return dst
+        p = self.p
+        
+        A = Y * Y % p
+        B = 4 * X * A % p
+        C = 8 * A * A % p
+        D = 3 * X * X % p
+        
+        X3 = (D * D - 2 * B) % p
+        dst.Y = (D * (B - X3) - C) % p
+        dst.Z = 2 * Y * Z % p
+        dst.X = X3
+        return dst
+    
+    def _jac_add(self, src1, src2, dst):
+        """dst = src1 + src2 in Jacobian coordinates (no inversion); dst may be either source"""
+        X1, Y1, Z1 = src1.X, src1.Y, src1.Z
+        X2, Y2, Z2 = src2.X, src2.Y, src2.Z
+        if Z1 == 0:
+            dst.X, dst.Y, dst.Z = X2, Y2, Z2
+            return dst
+        if Z2 == 0:
+            dst.X, dst.Y, dst.Z = X1, Y1, Z1
+            return dst
+        p = self.p
+        
+        Z1Z1 = Z1 * Z1 % p
+        Z2Z2 = Z2 * Z2 % p
+        U1 = X1 * Z2Z2 % p
+        U2 = X2 * Z1Z1 % p
+        S1 = Y1 * Z2 * Z2Z2 % p
+        S2 = Y2 * Z1 * Z1Z1 % p
+        H = (U2 - U1) % p
+        R = (S2 - S1) % p
+        
+        # Same x-coordinate: either the same point or inverses of each other
+        if H == 0:
+            if R == 0:
+                return self._jac_double(src1, dst)
+            dst.set_infinity()
+            return dst
+        
+        HH = H * H % p
+        HHH = H * HH % p
+        V = U1 * HH % p
+        
+        X3 = (R * R - HHH - 2 * V) % p
+        dst.Y = (R * (V - X3) - S1 * HHH) % p
+        dst.Z = Z1 * Z2 * H % p
+        dst.X = X3
+        return dst
+    
+    def _jac_add_affine(self, src, Q, dst):
+        """dst = src + affine point Q (mixed addition, Z2 = 1); dst may be src"""
+        X1, Y1, Z1 = src.X, src.Y, src.Z
+        if self.is_point_at_infinity(Q):
+            dst.X, dst.Y, dst.Z = X1, Y1, Z1
+            return dst
+        x2, y2 = Q
+        if Z1 == 0:
+            dst.X, dst.Y, dst.Z = x2, y2, mpz(1)
+            return dst
+        p = self.p
+        
+        Z1Z1 = Z1 * Z1 % p
+        U2 = x2 * Z1Z1 % p
+        S2 = y2 * Z1 * Z1Z1 % p
+        H = (U2 - X1) % p
+        R = (S2 - Y1) % p
+        
+        # Same x-coordinate: either the same point or inverses of each other
+        if H == 0:
+            if R == 0:
+                return self._jac_double(src, dst)
+            dst.set_infinity()
+            return dst
+        
+        HH = H * H % p
+        HHH = H * HH % p
+        V = X1 * HH % p
+        
+        X3 = (R * R - HHH - 2 * V) % p
+        dst.Y = (R * (V - X3) - Y1 * HHH) % p
+        dst.Z = Z1 * H % p
+        dst.X = X3
+        return dst
+    
+    @staticmethod
+    def _wnaf(k, w=5):
+        """Width-w non-adjacent form of k >= 0, least significant digit first.
+        
+        Every non-zero digit is odd with |d| < 2^(w-1), and any w consecutive
+        digits contain at most one non-zero digit.
+        """
+        digits = []
+        width = 1 << w
+        half = width >> 1
+        while k > 0:
+            # Skip the whole run of zero digits with one shift instead of one per bit
+            zeros = (k & -k).bit_length() - 1
+            if zeros:
+                digits.extend([0] * zeros)
+                k >>= zeros
+            d = k & (width - 1)
+            if d >= half:
+                d -= width
+            digits.append(d)
+            k = (k - d) >> 1
+        return digits
+    
+    def _odd_multiples(self, J, w):
+        """Affine table [J, 3J, 5J, ..., (2^(w-1) - 1)J] for wNAF digits"""
+        J2 = self._jac_double(J, JacobianPoint())
+        table = [J]
+        for _ in range((1 << (w - 2)) - 1):
+            table.append(self._jac_add(table[-1], J2, JacobianPoint()))
+        return self.to_affine_batch(table)
+    
+    def scalar_multiply(self, k, P, w=5):
+        """Multiply point P by scalar k using width-w NAF in Jacobian coordinates"""
         if k == 0 or self.is_point_at_infinity(P):
             return self.O
         
@@ -151,99 +365,328 @@ class EllipticCurve:
         # Handle negative k
         if k < 0:
             k = -k
-            x, y = P
-            P = (x, FiniteField.subtract(0, y, self.p))  # Negate point
+            P = self.negate(P)
         
-        # Double-and-add algorithm
-        result = self.O
-        addend = P
+        if self.use_numba and self._fits_limbs(P, k):
+            return self._from_limbs(self.numba.multiply(k, k.bit_length(), *P))
         
-        while k > 0:
-            if k & 1:  # If k is odd
-                result = self.point_add(result, addend)
-            addend = self.point_double(addend)
-            k >>= 1
+        return self.to_affine(self._wnaf_multiply(k, P, w))
+    
+    def _wnaf_multiply(self, k, P, w=5):
+        """k * P as a JacobianPoint for k > 0 and affine P, using width-w NAF"""
+        if self.p == SECP256K1_P:
+            return self._glv_multiply(k, P, w)
+        
+        # Odd multiples of P and their negations, indexed by |d| // 2
+        table = self._odd_multiples(self.to_jacobian(P), w)
+        neg_table = [self.negate(Q) for Q in table]
+        
+        # Left-to-right wNAF with mixed additions, updating one accumulator in place
+        jac_double = self._jac_double
+        jac_add_affine = self._jac_add_affine
+        result = JacobianPoint()
+        for d in reversed(self._wnaf(k, w)):
+            jac_double(result, result)
+            if d > 0:
+                jac_add_affine(result, table[d >> 1], result)
+            elif d < 0:
+                jac_add_affine(result, neg_table[-d >> 1], result)
+        
+        return result
+    
+    @staticmethod
+    def _split_scalar(k):
+        """Split k into (k1, k2) with k = k1 + k2 * LAMBDA (mod n) and |k1|, |k2| <= 2^128"""
+        n = SECP256K1_N
+        c1 = (SECP256K1_B2 * k + n // 2) // n
+        c2 = (-SECP256K1_B1 * k + n // 2) // n
+        k1 = k - c1 * SECP256K1_A1 - c2 * SECP256K1_A2
+        k2 = -c1 * SECP256K1_B1 - c2 * SECP256K1_B2
+        return k1, k2
+    
+    def _glv_multiply(self, k, P, w=5):
+        """k * P as a JacobianPoint on secp256k1 via the GLV endomorphism.
+        
+        k * P = k1 * P + k2 * phi(P) with half-length k1, k2, evaluated with one
+        shared chain of ~128 doublings (interleaved wNAF).
+        """
+        p = self.p
+        k1, k2 = self._split_scalar(k % SECP256K1_N)
+        
+        # phi(jP) = (BETA * x_j, y_j): the second table costs one multiply per entry
+        table = self._odd_multiples(self.to_jacobian(P), w)
+        phi_table = [self.O if Q is None else (SECP256K1_BETA * Q[0] % p, Q[1]) for Q in table]
+        
+        # (digits, table for positive digits, table for negative digits) per half scalar
+        streams = []
+        for k_half, pos in ((k1, table), (k2, phi_table)):
+            neg = [self.negate(Q) for Q in pos]
+            if k_half < 0:
+                k_half, pos, neg = -k_half, neg, pos
+            streams.append((self._wnaf(k_half, w), pos, neg))
+        
+        jac_double = self._jac_double
+        jac_add_affine = self._jac_add_affine
+        result = JacobianPoint()
+        for i in range(max(len(digits) for digits, _, _ in streams) - 1, -1, -1):
+            jac_double(result, result)
+            for digits, pos, neg in streams:
+                if i < len(digits):
+                    d = digits[i]
+                    if d > 0:
+                        jac_add_affine(result, pos[d >> 1], result)
+                    elif d < 0:
+                        jac_add_affine(result, neg[-d >> 1], result)
         
         return result
+    
+    def scalar_multiply_ct(self, k, P, order):
+        """Multiply point P by secret scalar k using the Montgomery ladder.
+        
+        order must be a multiple of the order of P (e.g. the group order n).
+        k is replaced by k + n or k + 2n, whichever has bit length
+        n.bit_length() + 1, so the top bit is always set: the ladder starts
+        from (P, 2P) and runs n.bit_length() steps of one addition and one
+        doubling for every k. Before the last step R0 and R1 hold multiples
+        of P below n, so they never reach the point at infinity (which takes
+        the cheap shortcut in _jac_add and _jac_double). The exceptions are
+        k = 1, n - 2 and n - 1 (mod n): their last step starts with R0 = nP
+        or R1 = nP, i.e. at infinity, and no other padding of fixed length
+        exists for them.
+        """
+        k %= order
+        if k == 0 or self.is_point_at_infinity(P):
+            return self.O
+        
+        nbits = order.bit_length()
+        k += order
+        if k.bit_length() <= nbits:
+            k += order
+        
+        if self.use_numba and self._fits_limbs(P, k - (1 << nbits)):
+            # The kernel supplies the fixed top bit itself
+            return self._from_limbs(self.numba.multiply_ct(k - (1 << nbits), nbits, *P))
+        
+        # Invariant: R[1] - R[0] == P
+        R = [self.to_jacobian(P), self._jac_double(self.to_jacobian(P), JacobianPoint())]
+        for i in range(nbits - 1, -1, -1):
+            bit = (k >> i) & 1
+            self._jac_add(R[0], R[1], R[1 - bit])
+            self._jac_double(R[bit], R[bit])
+        
+        return self.to_affine(R[0])
 
 class ECDSA:
     """ECDSA signature scheme implementation"""
     
-    def __init__(self, p, o, G):
-        self.p = p  # Prime modulus for the field
-        self.o = o  # Order of the curve (number of points)
-        self.G = G  # Base point
-        self.curve = EllipticCurve(p)
+    def __init__(self, p, o, G, use_numba=False):
+        self.p = mpz(p)  # Prime modulus for the field
+        self.o = mpz(o)  # Order of the curve (number of points)
+        self.G = (mpz(G[0]), mpz(G[1]))  # Base point
+        self.curve = EllipticCurve(self.p, use_numba)
+        self.G_table = None  # Fixed-base table for k * G, built on first use
+    
+    def _build_comb_table(self, P, w=4):
+        """Precompute T[i][j] = j * 2^(w*i) * P (affine) for every w-bit window of a scalar < o"""
+        curve = self.curve
+        windows = (self.o.bit_length() + w - 1) // w
+        table = []
+        base = curve.to_jacobian(P)
+        for _ in range(windows):
+            row = [JacobianPoint(), base]
+            for _ in range(2, 1 << w):
+                row.append(curve._jac_add(row[-1], base, JacobianPoint()))
+            table.append(row)
+            base = curve._jac_double(row[1 << (w - 1)], JacobianPoint())  # 2^w * base
+        
+        # Normalize the whole table with one inversion so lookups use mixed additions
+        size = 1 << w
+        flat = curve.to_affine_batch([J for row in table for J in row])
+        return [flat[i:i + size] for i in range(0, len(flat), size)]
+    
+    def _comb_multiply(self, k, w=4):
+        """k * G as a JacobianPoint from the comb table, for 0 <= k < 2^(w * len(G_table))"""
+        # One table addition per w-bit window of k, no doublings
+        jac_add_affine = self.curve._jac_add_affine
+        mask = (1 << w) - 1
+        result = JacobianPoint()
+        for row in self.G_table:
+            digit = k & mask
+            if digit:
+                jac_add_affine(result, row[digit], result)
+            k >>= w
+        
+        return result
+    
+    def _verify_mul(self, u1, u2, Q, w=2):
+        """Compute u1 * G + u2 * Q with one shared doubling chain (Shamir/Strauss trick),
+        or with the comb table for u1 * G once verify_batch has built it"""
+        curve = self.curve
+        if (curve.use_numba and not curve.is_point_at_infinity(Q)
+                and curve._fits_limbs(self.G, u1, u2) and curve._fits_limbs(Q)):
+            nbits = max(u1.bit_length(), u2.bit_length())
+            return curve._from_limbs(curve.numba.double_multiply(u1, *self.G, u2, *Q, nbits))
+        
+        # A comb table built by an earlier verify_batch beats Shamir; building
+        # one just for this call (~4 ms on secp256k1) does not
+        if self.G_table is not None:
+            R = self._comb_multiply(u1)
+            if not curve.is_point_at_infinity(Q):
+                curve._jac_add(R, curve._wnaf_multiply(u2, Q), R)
+            return curve.to_affine(R)
+        
+        jac_add = curve._jac_add
+        jac_add_affine = curve._jac_add_affine
+        jac_double = curve._jac_double
+        size = 1 << w
+        
+        # Joint table T[i * 2^w + j] = i*G + j*Q for 0 <= i, j < 2^w
+        G_multiples = [JacobianPoint(), curve.to_jacobian(self.G)]
+        Q_multiples = [JacobianPoint(), curve.to_jacobian(Q)]
+        for _ in range(2, size):
+            G_multiples.append(jac_add(G_multiples[-1], G_multiples[1], JacobianPoint()))
+            Q_multiples.append(jac_add(Q_multiples[-1], Q_multiples[1], JacobianPoint()))
+        table = curve.to_affine_batch(
+            [jac_add(iG, jQ, JacobianPoint()) for iG in G_multiples for jQ in Q_multiples]
+        )
+        
+        # Scan both scalars w bits at a time from the most significant window
+        mask = size - 1
+        nbits = max(u1.bit_length(), u2.bit_length())
+        result = JacobianPoint()
+        for i in range(((nbits + w - 1) // w - 1) * w, -1, -w):
+            for _ in range(w):
+                jac_double(result, result)
+            index = ((u1 >> i) & mask) << w | ((u2 >> i) & mask)
+            if index:
+                jac_add_affine(result, table[index], result)
+        
+        return curve.to_affine(result)
     
     def generate_keypair(self):
         """Generate a random private/public key pair"""
         # Generate random private key d in range [1, o-1]
-        d = random.randint(1, self.o - 1)
+        d = secrets.randbelow(self.o - 1) + 1
         
-        # Compute public key Q = d * G
-        Q = self.curve.scalar_multiply(d, self.G)
+        # Compute public key Q = d * G (d is secret: constant-time ladder)
+        Q = self.curve.scalar_multiply_ct(d, self.G, self.o)
         
         return d, Q
     
     def sign(self, d, h):
         """Sign hash h with private key d"""
         while True:
-            # Generate random k in range [1, o-1]
-            k = random.randint(1, self.o - 1)
-            
-            # Compute R = k * G
-            R = self.curve.scalar_multiply(k, self.G)
-            if self.curve.is_point_at_infinity(R):
-                continue
-            
-            r = R[0]  # x-coordinate of R
-            if r == 0:
-                continue
-            
-            # Compute k^(-1) mod o
-            k_inv = FiniteField.inverse(k, self.o)
-            if k_inv == 0:
-                continue
-            
-            # Compute s = k^(-1) * (h + r * d) mod o
-            s = FiniteField.multiply(
-                k_inv,
-                FiniteField.add(h, FiniteField.multiply(r, d, self.o), self.o),
-                self.o
-            )
-            
-            if s == 0:
-                continue
-            
-            return r, s
+            # Generate random k in range [1, o-1]; only k changes on a retry
+            k = secrets.randbelow(self.o - 1) + 1
+            signature = self._sign_with_nonce(d, h, k)
+            if signature is not None:
+                return signature
+    
+    def _sign_with_nonce(self, d, h, k):
+        """Sign hash h with private key d and nonce k; returns None if k must be redrawn
+        
+        Internal to sign: a reused or biased k reveals d, so k must always come
+        from secrets.randbelow.
+        
+        For a prime group order the retry cases (R = O, r = 0, s = 0) each occur with
+        probability about 1/o, so on secp256k1 the first nonce is used in practice.
+        """
+        o = self.o
+        curve = self.curve
+        
+        # Compute R = k * G (k is secret: constant-time ladder)
+        R = curve.scalar_multiply_ct(k, self.G, o)
+        if curve.is_point_at_infinity(R):
+            return None
+        
+        r = R[0]  # x-coordinate of R
+        if r == 0:
+            return None
+        
+        # Compute k^(-1) mod o
+        k_inv = FiniteField.inverse(k, o)
+        if k_inv == 0:
+            return None
+        
+        # Compute s = k^(-1) * (h + r * d) mod o
+        s = k_inv * ((h + r * d) % o) % o
+        if s == 0:
+            return None
+        
+        return r, s
     
     def verify(self, Q, r, s, h):
         """Verify signature (r,s) for hash h with public key Q"""
+        o = self.o
+        
         # Check if r and s are in valid range
-        if r <= 0 or r >= self.o or s <= 0 or s >= self.o:
+        if r <= 0 or r >= o or s <= 0 or s >= o:
             return False
         
         # Compute s^(-1) mod o
-        s_inv = FiniteField.inverse(s, self.o)
+        s_inv = FiniteField.inverse(s, o)
         if s_inv == 0:
             return False
         
-        # Compute u1 = h * s^(-1) mod o
-        u1 = FiniteField.multiply(h, s_inv, self.o)
-        
-        # Compute u2 = r * s^(-1) mod o
-        u2 = FiniteField.multiply(r, s_inv, self.o)
+        # Compute u1 = h * s^(-1) mod o and u2 = r * s^(-1) mod o
+        u1 = h * s_inv % o
+        u2 = r * s_inv % o
         
         # Compute R = u1 * G + u2 * Q
-        point1 = self.curve.scalar_multiply(u1, self.G)
-        point2 = self.curve.scalar_multiply(u2, Q)
-        R = self.curve.point_add(point1, point2)
+        R = self._verify_mul(u1, u2, Q)
         
         if self.curve.is_point_at_infinity(R):
             return False
         
         # Check if x-coordinate of R equals r
         return R[0] == r
+    
+    def verify_batch(self, pubkeys, rs, ss, hs):
+        """Verify many signatures (Q_i, r_i, s_i, h_i); returns one bool per signature
+        
+        Same checks as verify, but all s_i are inverted together, every u1_i * G
+        reuses the fixed-base comb table, and all R_i = u1_i * G + u2_i * Q_i are
+        converted to affine with one shared inversion (Montgomery's trick).
+        """
+        o = self.o
+        curve = self.curve
+        results = [False] * len(rs)
+        if self.G_table is None and not curve.use_numba:
+            self.G_table = self._build_comb_table(self.G)
+        
+        # Check if r and s are in valid range
+        valid = [i for i in range(len(rs)) if 0 < rs[i] < o and 0 < ss[i] < o]
+        
+        # Compute every s^(-1) mod o with a single inversion; if some s_i has no
+        # inverse (composite o) the batch fails as a whole, so invert one by one
+        s_invs = FiniteField.batch_inverse([ss[i] for i in valid], o)
+        if not all(s_invs):
+            s_invs = [FiniteField.inverse(ss[i], o) for i in valid]
+        
+        # Compute R_i = u1_i * G + u2_i * Q_i
+        indices = []
+        points = []
+        for i, s_inv in zip(valid, s_invs):
+            if s_inv == 0:
+                continue
+            u1 = hs[i] * s_inv % o
+            u2 = rs[i] * s_inv % o
+            if curve.use_numba:
+                R = self._verify_mul(u1, u2, pubkeys[i])
+                results[i] = not curve.is_point_at_infinity(R) and R[0] == rs[i]
+            else:
+                R = self._comb_multiply(u1)
+                Q = pubkeys[i]
+                if not curve.is_point_at_infinity(Q):
+                    curve._jac_add(R, curve._wnaf_multiply(u2, Q), R)
+                indices.append(i)
+                points.append(R)
+        
+        # Check if x-coordinate of each R_i equals r_i
+        for i, R in zip(indices, curve.to_affine_batch(points)):
+            results[i] = not curve.is_point_at_infinity(R) and R[0] == rs[i]
+        
+        return results
 
 def main():
     if len(sys.argv) < 2:
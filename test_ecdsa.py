@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Checks every fast path against plain-integer and affine references
+
+Run with: python3 -m unittest
+"""
+
+import random
+import unittest
+
+from ecdsa import ECDSA, EllipticCurve, SECP256K1_P, SECP256K1_N, SECP256K1_BETA, SECP256K1_LAMBDA, _load_numba
+
+_ff_numba = _load_numba()
+
+SECP256K1_G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+
+# Test parameters from the README
+README_CURVES = [
+    (43, 31, (25, 25)),
+    (79, 67, (35, 8)),
+    (127, 127, (93, 33)),
+    (733, 691, (336, 170)),
+]
+
+# Field elements around the limb boundaries and the modulus
+EDGE_VALUES = [0, 1, 2, 977, 2**32 + 977, 2**64 - 1, 2**64, 2**128 - 1, 2**255,
+               SECP256K1_P - 2**64, SECP256K1_P - 2, SECP256K1_P - 1]
+
+
+def affine_multiply(curve, k, P):
+    """k * P by textbook double-and-add on the affine point_add/point_double"""
+    R = curve.O
+    for bit in bin(k)[2:]:
+        R = curve.point_double(R)
+        if bit == '1':
+            R = curve.point_add(R, P)
+    return R
+
+
+@unittest.skipIf(_ff_numba is None, "numba is not installed")
+class TestLimbArithmetic(unittest.TestCase):
+    """_ff_numba field operations against Python integers mod p"""
+
+    def setUp(self):
+        rng = random.Random(1)
+        self.values = EDGE_VALUES + [rng.randrange(SECP256K1_P) for _ in range(20)]
+
+    def apply(self, op, *args):
+        out = _ff_numba.to_limbs(0)
+        op(*[_ff_numba.to_limbs(a) for a in args], out)
+        return _ff_numba.from_limbs(out)
+
+    def test_round_trip(self):
+        for a in self.values:
+            self.assertEqual(_ff_numba.from_limbs(_ff_numba.to_limbs(a)), a)
+
+    def test_add_sub_mul(self):
+        p = SECP256K1_P
+        for a in self.values:
+            for b in self.values:
+                self.assertEqual(self.apply(_ff_numba.add_mod, a, b), (a + b) % p)
+                self.assertEqual(self.apply(_ff_numba.sub_mod, a, b), (a - b) % p)
+                self.assertEqual(self.apply(_ff_numba.mul_mod, a, b), a * b % p)
+
+    def test_largest_product(self):
+        # (p - 1)^2 is the largest product mul_mod has to fold
+        p = SECP256K1_P
+        self.assertEqual(self.apply(_ff_numba.mul_mod, p - 1, p - 1), (p - 1) ** 2 % p)
+
+    def test_inverse(self):
+        p = SECP256K1_P
+        for a in self.values:
+            self.assertEqual(self.apply(_ff_numba.inv_mod, a), pow(a, -1, p) if a else 0)
+
+
+class TestGLV(unittest.TestCase):
+    """secp256k1 endomorphism constants and scalar splitting"""
+
+    def test_endomorphism(self):
+        curve = EllipticCurve(SECP256K1_P)
+        x, y = SECP256K1_G
+        # LAMBDA * G = phi(G) = (BETA * x, y)
+        self.assertEqual(curve.scalar_multiply(SECP256K1_LAMBDA, SECP256K1_G),
+                         (SECP256K1_BETA * x % SECP256K1_P, y))
+
+    def test_split_scalar(self):
+        n = SECP256K1_N
+        rng = random.Random(5)
+        scalars = [0, 1, 2, n // 2, n - 2, n - 1, SECP256K1_LAMBDA, n - SECP256K1_LAMBDA]
+        scalars += [rng.randrange(n) for _ in range(1000)]
+        for k in scalars:
+            k1, k2 = EllipticCurve._split_scalar(k)
+            self.assertEqual((k1 + k2 * SECP256K1_LAMBDA) % n, k, k)
+            self.assertLessEqual(abs(k1), 2**128, k)
+            self.assertLessEqual(abs(k2), 2**128, k)
+
+
+class TestScalarMultiply(unittest.TestCase):
+    """Every scalar multiplication path against the affine reference"""
+
+    def test_small_curves(self):
+        for p, o, G in README_CURVES:
+            curve = EllipticCurve(p)
+            for k in range(2 * o + 2):
+                expected = affine_multiply(curve, k, G)
+                self.assertEqual(curve.scalar_multiply(k, G), expected, (p, k))
+                self.assertEqual(curve.scalar_multiply_ct(k, G, o), expected, (p, k))
+
+    def test_secp256k1(self):
+        curve = EllipticCurve(SECP256K1_P)
+        n = SECP256K1_N
+        rng = random.Random(2)
+        scalars = [1, 2, 3, n - 1, n - 2, n // 2, 2**128, 2**255] + [rng.randrange(1, n) for _ in range(5)]
+        for k in scalars:
+            expected = affine_multiply(curve, k, SECP256K1_G)
+            self.assertEqual(curve.scalar_multiply(k, SECP256K1_G), expected, k)
+            self.assertEqual(curve.scalar_multiply_ct(k, SECP256K1_G, n), expected, k)
+
+    @unittest.skipIf(_ff_numba is None, "numba is not installed")
+    def test_secp256k1_numba(self):
+        pure = EllipticCurve(SECP256K1_P)
+        fast = EllipticCurve(SECP256K1_P, use_numba=True)
+        n = SECP256K1_N
+        rng = random.Random(3)
+        scalars = [1, 2, 3, n - 1, n - 2, n // 2, 2**128, 2**255] + [rng.randrange(1, n) for _ in range(5)]
+        for k in scalars:
+            expected = pure.scalar_multiply(k, SECP256K1_G)
+            self.assertEqual(fast.scalar_multiply(k, SECP256K1_G), expected, k)
+            self.assertEqual(fast.scalar_multiply_ct(k, SECP256K1_G, n), expected, k)
+
+        pure_ecdsa = ECDSA(SECP256K1_P, n, SECP256K1_G)
+        fast_ecdsa = ECDSA(SECP256K1_P, n, SECP256K1_G, use_numba=True)
+        Q = pure.scalar_multiply(rng.randrange(1, n), SECP256K1_G)
+        for _ in range(5):
+            u1, u2 = rng.randrange(1, n), rng.randrange(1, n)
+            self.assertEqual(fast_ecdsa._verify_mul(u1, u2, Q), pure_ecdsa._verify_mul(u1, u2, Q))
+
+
+class TestSignVerify(unittest.TestCase):
+    """sign/verify round trips"""
+
+    def test_readme_example(self):
+        ecdsa = ECDSA(43, 31, (25, 25))
+        self.assertEqual(ecdsa._sign_with_nonce(16, 30, 17), (12, 24))
+        self.assertTrue(ecdsa.verify((37, 36), 12, 24, 30))
+        self.assertFalse(ecdsa.verify((37, 36), 12, 24, 29))
+
+    def test_readme_curves(self):
+        rng = random.Random(4)
+        for p, o, G in README_CURVES:
+            ecdsa = ECDSA(p, o, G)
+            for _ in range(10):
+                d, Q = ecdsa.generate_keypair()
+                self.assertEqual(Q, affine_multiply(ecdsa.curve, d, ecdsa.G))
+                h = rng.randrange(1, o)
+                for k in range(1, o):
+                    signature = ecdsa._sign_with_nonce(d, h, k)
+                    # sign does not reduce r = R.x mod o, so r >= o can come out on these curves
+                    if signature is None or signature[0] >= o:
+                        continue
+                    r, s = signature
+                    self.assertTrue(ecdsa.verify(Q, r, s, h), (p, d, h, k))
+                    self.assertEqual(ecdsa.verify_batch([Q, Q], [r, r], [s, s], [h, h + 1]),
+                                     [True, ecdsa.verify(Q, r, s, h + 1)])
+                    self.assertEqual(ecdsa._verify_mul(h, r, Q),
+                                     ecdsa.curve.point_add(affine_multiply(ecdsa.curve, h, ecdsa.G),
+                                                           affine_multiply(ecdsa.curve, r, Q)))
+
+    def test_batch_with_non_invertible_s(self):
+        # Composite order 12: s = 2 has no inverse, the valid signature must still pass
+        ecdsa = ECDSA(11, 12, (4, 4))
+        Q = ecdsa.curve.scalar_multiply(1, ecdsa.G)
+        r, s = ecdsa._sign_with_nonce(1, 1, 1)
+        self.assertEqual([ecdsa.verify(Q, r, s, 1), ecdsa.verify(Q, r, 2, 1)], [True, False])
+        self.assertEqual(ecdsa.verify_batch([Q, Q], [r, r], [s, 2], [1, 1]), [True, False])
+
+    def test_secp256k1(self):
+        ecdsa = ECDSA(SECP256K1_P, SECP256K1_N, SECP256K1_G)
+        d, Q = ecdsa.generate_keypair()
+        r, s = ecdsa.sign(d, 12345)
+        self.assertTrue(ecdsa.verify(Q, r, s, 12345))
+        self.assertFalse(ecdsa.verify(Q, r, s, 12346))
+        self.assertEqual(ecdsa.verify_batch([Q, Q], [r, r], [s, s], [12345, 12346]), [True, False])
+        # verify_batch built the comb table; verify now reads it for u1 * G
+        self.assertIsNotNone(ecdsa.G_table)
+        self.assertTrue(ecdsa.verify(Q, r, s, 12345))
+        self.assertFalse(ecdsa.verify(Q, r, s, 12346))
+
+
+if __name__ == "__main__":
+    unittest.main()